@@ -4,89 +4,99 @@ Advanced filtering with multiple criteria
 """
 import json
 import argparse
-from typing import List, Dict, Any
+import math
+import sys
+from functools import lru_cache
+from operator import itemgetter
+from typing import List, Dict
 
-def load_content(filename='data/yoto-content.json') -> List[Dict[str, Any]]:
-    """Load content from JSON file"""
-    with open(filename, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    return data.get('data', {}).get('products', [])
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from search import load_content
+
+def strip_cached_fields(product: Dict) -> Dict:
+    """Return a copy of a product without the keys added by normalize_products"""
+    return {k: v for k, v in product.items() if not k.startswith('_')}
+
+def range_predicate(key: str, low: float = None, high: float = None):
+    """Build a predicate for low <= product[key] <= high that rejects missing values"""
+    low = -math.inf if low is None else low
+    high = math.inf if high is None else high
+
+    def pred(p):
+        value = p[key]
+        return value is not None and low <= value <= high
+    return pred
 
 def apply_filters(products: List[Dict], args) -> List[Dict]:
-    """Apply all filters based on arguments"""
-    results = products
+    """Apply all filters based on arguments in a single pass over products"""
+    preds = []
 
     # Text search
     if args.search:
         query = args.search.lower()
-        results = [p for p in results if query in p.get('title', '').lower()]
+        preds.append(lambda p: query in p['_title_lc'])
 
     # Author filter
     if args.author:
         author_query = args.author.lower()
-        results = [p for p in results if author_query in p.get('author', '').lower()]
+        preds.append(lambda p: author_query in p['_author_lc'])
 
     # Content type filter
     if args.content_type:
         ct_query = args.content_type.lower()
-        results = [p for p in results
-                  if any(ct_query in ct.lower() for ct in p.get('contentType', []))]
+        preds.append(lambda p: any(ct_query in ct for ct in p['_ct_lc']))
 
-    # Age range filter
-    if args.min_age is not None:
-        results = [p for p in results
-                  if p.get('ageRange') and len(p['ageRange']) >= 2
-                  and p['ageRange'][1] is not None and p['ageRange'][1] >= args.min_age]
+    # Language filter
+    if args.language:
+        lang_query = args.language.lower()
+        preds.append(lambda p: any(lang_query in lang for lang in p['_lang_lc']))
 
+    # Age range filter: a product matches if its range overlaps the requested one
+    if args.min_age is not None:
+        preds.append(range_predicate('_age_max', low=args.min_age))
     if args.max_age is not None:
-        results = [p for p in results
-                  if p.get('ageRange') and len(p['ageRange']) >= 2
-                  and p['ageRange'][0] is not None and p['ageRange'][0] <= args.max_age]
+        preds.append(range_predicate('_age_min', high=args.max_age))
 
     # Price range filter
-    if args.min_price is not None:
-        results = [p for p in results
-                  if p.get('price') and float(p['price']) >= args.min_price]
-
-    if args.max_price is not None:
-        results = [p for p in results
-                  if p.get('price') and float(p['price']) <= args.max_price]
+    if args.min_price is not None or args.max_price is not None:
+        preds.append(range_predicate('_price', args.min_price, args.max_price))
 
     # Runtime filter (in minutes)
-    if args.min_runtime is not None:
-        min_seconds = args.min_runtime * 60
-        results = [p for p in results
-                  if p.get('runtime') and p['runtime'] >= min_seconds]
-
-    if args.max_runtime is not None:
-        max_seconds = args.max_runtime * 60
-        results = [p for p in results
-                  if p.get('runtime') and p['runtime'] <= max_seconds]
+    if args.min_runtime is not None or args.max_runtime is not None:
+        min_seconds = args.min_runtime * 60 if args.min_runtime is not None else None
+        max_seconds = args.max_runtime * 60 if args.max_runtime is not None else None
+        preds.append(range_predicate('_runtime', min_seconds, max_seconds))
 
     # Availability filter
     if args.available_only:
-        results = [p for p in results if p.get('availableForSale', False)]
+        preds.append(itemgetter('_available'))
 
     # New items filter
     if args.new_only:
-        results = [p for p in results if p.get('flag') == 'New to Yoto']
-
-    # Language filter
-    if args.language:
-        lang_query = args.language.lower()
-        results = [p for p in results
-                  if any(lang_query in lang.lower() for lang in p.get('languages', []))]
+        preds.append(itemgetter('_is_new'))
 
-    return results
+    if not preds:
+        return products
+    # Chained filter() iterators still make one lazy pass, without a per-product all() generator
+    results = products
+    for pred in preds:
+        results = filter(pred, results)
+    return list(results)
 
 def sort_results(results: List[Dict], sort_by: str, reverse: bool = False) -> List[Dict]:
     """Sort results by specified field"""
     if sort_by == 'price':
-        return sorted(results, key=lambda p: float(p.get('price', 0)), reverse=reverse)
+        return sorted(results, key=lambda p: p['_price'] or 0.0, reverse=reverse)
     elif sort_by == 'runtime':
-        return sorted(results, key=lambda p: p.get('runtime', 0), reverse=reverse)
+        return sorted(results, key=lambda p: p['_runtime'] or 0, reverse=reverse)
     elif sort_by == 'age':
-        return sorted(results, key=lambda p: p.get('ageRange', [0])[0], reverse=reverse)
+        return sorted(results, key=lambda p: p['_age_min'] or 0, reverse=reverse)
+    elif sort_by == 'title':
+        return sorted(results, key=itemgetter('_title_lc'), reverse=reverse)
     else:
         return sorted(results, key=lambda p: p.get(sort_by, ''), reverse=reverse)
 
@@ -96,6 +106,7 @@ def display_results(results: List[Dict], limit: int = None, format: str = 'summa
         results = results[:limit]
 
     if format == 'summary':
+        lines = []
         for i, p in enumerate(results, 1):
             title = p.get('title', 'Unknown')
             author = p.get('author', 'Unknown')
@@ -103,22 +114,29 @@ def display_results(results: List[Dict], limit: int = None, format: str = 'summa
             age_range = p.get('ageRange', [])
             age_str = f"{age_range[0]}-{age_range[1]}" if len(age_range) >= 2 else "N/A"
 
-            print(f"{i}. {title}")
-            print(f"   {author} | £{price} | Age {age_str}")
+            lines.append(f"{i}. {title}")
+            lines.append(f"   {author} | £{price} | Age {age_str}")
 
             content_types = ', '.join(p.get('contentType', []))
             if content_types:
-                print(f"   {content_types}")
-            print()
+                lines.append(f"   {content_types}")
+            lines.append("")
+        sys.stdout.write('\n'.join(lines) + '\n')
 
     elif format == 'titles':
-        for p in results:
-            print(p.get('title', 'Unknown'))
+        sys.stdout.write(''.join(p.get('title', 'Unknown') + '\n' for p in results))
 
     elif format == 'json':
-        print(json.dumps(results, indent=2, ensure_ascii=False))
-
-def main():
+        output = [strip_cached_fields(p) for p in results]
+        if orjson:
+            sys.stdout.flush()
+            sys.stdout.buffer.write(orjson.dumps(output, option=orjson.OPT_INDENT_2) + b'\n')
+        else:
+            print(json.dumps(output, indent=2, ensure_ascii=False))
+
+@lru_cache(maxsize=1)
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser (once per process)"""
     parser = argparse.ArgumentParser(description='Advanced filtering for Yoto content')
 
     # Search filters
@@ -151,7 +169,10 @@ def main():
     parser.add_argument('--format', choices=['summary', 'titles', 'json'], default='summary',
                        help='Output format')
 
-    args = parser.parse_args()
+    return parser
+
+def main():
+    args = build_parser().parse_args()
 
     # Load and filter
     products = load_content()
@@ -4,19 +4,44 @@ Display Yoto content in various formats
 """
 import json
 import sys
-from typing import List, Dict, Any
+import textwrap
+from bisect import bisect_right
+from typing import List, Dict, Any, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Age group boundaries for bisect_right; a minimum age below 3 lands in the first label
+AGE_GROUP_BOUNDS = [3, 6, 9, 12]
+AGE_GROUP_LABELS = ['0-3', '3-6', '6-9', '9-12', '12+']
+
+# Column layout for display_table, bound once so each row is a single format call
+TABLE_ROW = "{:<40} {:<20} {:>8} {:>8} {:>10} {:<25}".format
 
 def load_content(filename='data/yoto-content.json') -> List[Dict[str, Any]]:
     """Load content from JSON file"""
-    with open(filename, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    with open(filename, 'rb') as f:
+        raw = f.read()
+    data = orjson.loads(raw) if orjson else json.loads(raw)
     return data.get('data', {}).get('products', [])
 
+def format_runtime(runtime_sec: int) -> Optional[str]:
+    """Format a runtime in seconds as '1h 5m' or '5m', or None if it is unknown"""
+    if not runtime_sec:
+        return None
+    hours, rest = divmod(runtime_sec, 3600)
+    mins = rest // 60
+    return f"{hours}h {mins}m" if hours else f"{mins}m"
+
 def display_table(products: List[Dict], max_items: int = 20):
     """Display products in a table format"""
-    print("\n" + "="*120)
-    print(f"{'Title':<40} {'Author':<20} {'Price':>8} {'Age':>8} {'Runtime':>10} {'Type':<25}")
-    print("="*120)
+    lines = [
+        "\n" + "="*120,
+        TABLE_ROW('Title', 'Author', 'Price', 'Age', 'Runtime', 'Type'),
+        "="*120,
+    ]
 
     for i, p in enumerate(products[:max_items]):
         title = p.get('title', 'Unknown')[:38]
@@ -25,81 +50,69 @@ def display_table(products: List[Dict], max_items: int = 20):
         age_range = p.get('ageRange', [])
         age_str = f"{age_range[0]}-{age_range[1]}" if len(age_range) >= 2 else "N/A"
 
-        runtime_sec = p.get('runtime', 0)
-        if runtime_sec:
-            hours = runtime_sec // 3600
-            mins = (runtime_sec % 3600) // 60
-            runtime_str = f"{hours}h {mins}m" if hours else f"{mins}m"
-        else:
-            runtime_str = "N/A"
+        runtime_str = format_runtime(p.get('runtime', 0)) or "N/A"
 
         content_types = p.get('contentType', [])
         type_str = content_types[0][:23] if content_types else "N/A"
 
-        print(f"{title:<40} {author:<20} {price:>8} {age_str:>8} {runtime_str:>10} {type_str:<25}")
+        lines.append(TABLE_ROW(title, author, price, age_str, runtime_str, type_str))
 
     if len(products) > max_items:
-        print(f"\n... and {len(products) - max_items} more products")
-    print("="*120 + "\n")
+        lines.append(f"\n... and {len(products) - max_items} more products")
+    lines.append("="*120 + "\n")
+    sys.stdout.write('\n'.join(lines) + '\n')
 
 def display_cards(products: List[Dict], max_items: int = 10):
     """Display products in a card format"""
+    lines = []
     for i, p in enumerate(products[:max_items]):
-        print("\n┌" + "─"*78 + "┐")
-        print(f"│ {p.get('title', 'Unknown'):<76} │")
-        print("├" + "─"*78 + "┤")
+        lines.append("\n┌" + "─"*78 + "┐")
+        lines.append(f"│ {p.get('title', 'Unknown'):<76} │")
+        lines.append("├" + "─"*78 + "┤")
 
         author = f"Author: {p.get('author', 'Unknown')}"
-        print(f"│ {author:<76} │")
+        lines.append(f"│ {author:<76} │")
 
         price = f"Price: £{p.get('price', 'N/A')}"
         age_range = p.get('ageRange', [])
         age_str = f"Age: {age_range[0]}-{age_range[1]} years" if len(age_range) >= 2 else "Age: N/A"
         info_line = f"{price:<30} {age_str}"
-        print(f"│ {info_line:<76} │")
-
-        runtime_sec = p.get('runtime', 0)
-        if runtime_sec:
-            hours = runtime_sec // 3600
-            mins = (runtime_sec % 3600) // 60
-            if hours:
-                runtime_str = f"Runtime: {hours}h {mins}m"
-            else:
-                runtime_str = f"Runtime: {mins}m"
-            print(f"│ {runtime_str:<76} │")
+        lines.append(f"│ {info_line:<76} │")
+
+        runtime_str = format_runtime(p.get('runtime', 0))
+        if runtime_str:
+            runtime_str = f"Runtime: {runtime_str}"
+            lines.append(f"│ {runtime_str:<76} │")
 
         content_types = ', '.join(p.get('contentType', []))
         if content_types:
             type_str = f"Type: {content_types}"[:76]
-            print(f"│ {type_str:<76} │")
+            lines.append(f"│ {type_str:<76} │")
 
         blurb = p.get('blurb', '')
         if blurb:
             blurb_short = blurb[:150] + "..." if len(blurb) > 150 else blurb
-            # Split into lines
-            words = blurb_short.split()
-            line = ""
-            for word in words:
-                if len(line) + len(word) + 1 <= 74:
-                    line += word + " "
-                else:
-                    print(f"│ {line.strip():<76} │")
-                    line = word + " "
-            if line:
-                print(f"│ {line.strip():<76} │")
+            for line in textwrap.wrap(blurb_short, width=73, break_on_hyphens=False):
+                lines.append(f"│ {line:<76} │")
 
         available = "✓ Available" if p.get('availableForSale') else "✗ Not Available"
-        print(f"│ {available:<76} │")
+        lines.append(f"│ {available:<76} │")
 
-        print("└" + "─"*78 + "┘")
+        lines.append("└" + "─"*78 + "┘")
 
     if len(products) > max_items:
-        print(f"\n... and {len(products) - max_items} more products\n")
+        lines.append(f"\n... and {len(products) - max_items} more products\n")
+    if lines:
+        sys.stdout.write('\n'.join(lines) + '\n')
 
 def display_json(products: List[Dict], max_items: int = 5):
     """Display products as formatted JSON"""
     output = products[:max_items]
-    print(json.dumps(output, indent=2, ensure_ascii=False))
+    if orjson:
+        sys.stdout.flush()
+        sys.stdout.buffer.write(orjson.dumps(output, option=orjson.OPT_INDENT_2) + b'\n')
+    else:
+        print(json.dumps(output, indent=2, ensure_ascii=False))
     if len(products) > max_items:
         print(f"\n... and {len(products) - max_items} more products")
 
@@ -128,28 +141,13 @@ def display_grouped_by_type(products: List[Dict]):
 
 def display_by_age_groups(products: List[Dict]):
     """Display products grouped by age range"""
-    age_groups = {
-        '0-3': [],
-        '3-6': [],
-        '6-9': [],
-        '9-12': [],
-        '12+': []
-    }
+    age_groups = {label: [] for label in AGE_GROUP_LABELS}
+    buckets = list(age_groups.values())
 
     for p in products:
         age_range = p.get('ageRange', [])
-        if len(age_range) >= 2:
-            min_age = age_range[0]
-            if min_age < 3:
-                age_groups['0-3'].append(p)
-            elif min_age < 6:
-                age_groups['3-6'].append(p)
-            elif min_age < 9:
-                age_groups['6-9'].append(p)
-            elif min_age < 12:
-                age_groups['9-12'].append(p)
-            else:
-                age_groups['12+'].append(p)
+        if len(age_range) >= 2 and age_range[0] is not None:
+            buckets[bisect_right(AGE_GROUP_BOUNDS, age_range[0])].append(p)
 
     for age_range, items in age_groups.items():
         if items:
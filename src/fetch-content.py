@@ -3,8 +3,15 @@
 Fetch content from Yoto API and save to JSON file
 """
 import json
+import sys
 import urllib.request
 import urllib.error
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 def fetch_yoto_content(collection='library'):
     """Fetch content from Yoto API"""
@@ -26,7 +33,8 @@ def fetch_yoto_content(collection='library'):
     try:
         req = urllib.request.Request(url, headers=headers)
         with urllib.request.urlopen(req) as response:
-            data = json.loads(response.read().decode('utf-8'))
+            body = response.read()
+            data = orjson.loads(body) if orjson else json.loads(body.decode('utf-8'))
             return data
     except urllib.error.HTTPError as e:
         print(f"HTTP Error {e.code}: {e.reason}")
@@ -35,6 +43,33 @@ def fetch_yoto_content(collection='library'):
         print(f"Error fetching data: {e}")
         return None
 
+def fetch_collections(collections, max_workers=8):
+    """Fetch several collections concurrently, returning {collection: data}"""
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(collections))) as executor:
+        return dict(zip(collections, executor.map(fetch_yoto_content, collections)))
+
+def merge_collections(results):
+    """Merge fetched collections into one response, skipping duplicate products"""
+    merged = None
+    seen = set()
+    for collection, data in results.items():
+        if not data:
+            print(f"Skipping collection '{collection}'")
+            continue
+        if merged is None:
+            # Attach the product list to the first response so later appends land in it
+            merged = data
+            merged_products = merged.setdefault('data', {}).setdefault('products', [])
+            seen.update(p.get('id') for p in merged_products)
+            continue
+        for p in data.get('data', {}).get('products', []):
+            if p.get('id') not in seen:
+                seen.add(p.get('id'))
+                merged_products.append(p)
+    if merged is not None:
+        merged['data'].setdefault('info', {})['total'] = len(merged_products)
+    return merged
+
 def save_content(data, filename='data/yoto-content.json'):
     """Save content to JSON file"""
     import os
@@ -46,8 +81,12 @@ def save_content(data, filename='data/yoto-content.json'):
     print(f"Saved content to {filename}")
 
 if __name__ == '__main__':
-    print("Fetching Yoto content...")
-    content = fetch_yoto_content()
+    collections = sys.argv[1:] or ['library']
+    print(f"Fetching Yoto content ({', '.join(collections)})...")
+    if len(collections) == 1:
+        content = fetch_yoto_content(collections[0])
+    else:
+        content = merge_collections(fetch_collections(collections))
 
     if content:
         save_content(content)
@@ -4,9 +4,23 @@ Fetch search results from Yoto API
 This tries to use the API endpoint with query parameters
 """
 import json
+import os
+import time
+import urllib.parse
 import urllib.request
 import urllib.error
 import sys
+from typing import Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), 'yoto')
+API_CAPS_FILE = os.path.join(CACHE_DIR, 'api_caps.json')
+API_CAPS_TTL = 24 * 60 * 60  # re-probe the API once a day
+PROBE_QUERY = 'zzzzzz'  # matches no product, so any results mean q was ignored
 
 def fetch_yoto_search(query='', collection='library'):
     """Fetch content from Yoto API with optional search query"""
@@ -33,7 +47,8 @@ def fetch_yoto_search(query='', collection='library'):
         print(f"Fetching: {url}")
         req = urllib.request.Request(url, headers=headers)
         with urllib.request.urlopen(req) as response:
-            data = json.loads(response.read().decode('utf-8'))
+            body = response.read()
+            data = orjson.loads(body) if orjson else json.loads(body.decode('utf-8'))
             return data
     except urllib.error.HTTPError as e:
         print(f"HTTP Error {e.code}: {e.reason}")
@@ -42,6 +57,29 @@ def fetch_yoto_search(query='', collection='library'):
         print(f"Error fetching data: {e}")
         return None
 
+def api_supports_search() -> Optional[bool]:
+    """Whether the API filters by the q parameter, or None if it could not be probed"""
+    try:
+        with open(API_CAPS_FILE, 'r', encoding='utf-8') as f:
+            caps = json.load(f)
+        if time.time() - caps['checked_at'] < API_CAPS_TTL:
+            return caps['supports_search']
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    data = fetch_yoto_search(PROBE_QUERY)
+    if not data or 'data' not in data:
+        return None
+    supports_search = not data['data'].get('products')
+
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(API_CAPS_FILE, 'w', encoding='utf-8') as f:
+            json.dump({'supports_search': supports_search, 'checked_at': time.time()}, f)
+    except OSError:
+        pass
+    return supports_search
+
 def print_results(data, query=''):
     """Print search results"""
     if not data or 'data' not in data:
@@ -76,12 +114,19 @@ if __name__ == '__main__':
 
     # Note: The API might not support query parameter for search
     # If it doesn't work, we fall back to local filtering
+    supports_search = api_supports_search() if query else None
     data = fetch_yoto_search(query)
 
     if data:
         products = data.get('data', {}).get('products', [])
 
-        if query and len(products) == data.get('data', {}).get('info', {}).get('total', 0):
+        if supports_search is None:
+            # Probe failed, so guess from whether the API returned everything
+            needs_local_filter = len(products) == data.get('data', {}).get('info', {}).get('total', 0)
+        else:
+            needs_local_filter = not supports_search
+
+        if query and needs_local_filter:
             # API didn't filter, do local filtering
             print("\nNote: API doesn't appear to support search parameter.")
             print("Performing local filtering instead...")
@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""
+Write a preprocessed snapshot of the content file so the CLI tools skip JSON parsing
+"""
+import os
+import pickle
+import sys
+
+from search import CONTENT_FILE, SNAPSHOT_VERSION, parse_content, snapshot_path
+
+def write_snapshot(filename: str = CONTENT_FILE) -> str:
+    """Parse and normalize filename, then pickle the products next to it"""
+    stat = os.stat(filename)
+    products = parse_content(filename)
+    path = snapshot_path(filename)
+    with open(path, 'wb') as f:
+        pickle.dump({'version': SNAPSHOT_VERSION,
+                     'source': (stat.st_mtime_ns, stat.st_size),
+                     'products': products}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    print(f"Saved {len(products)} preprocessed products to {path}")
+    return path
+
+if __name__ == '__main__':
+    write_snapshot(sys.argv[1] if len(sys.argv) > 1 else CONTENT_FILE)
@@ -3,71 +3,143 @@
 Search and filter Yoto content with various criteria
 """
 import json
+import math
+import os
+import pickle
 import sys
-from typing import List, Dict, Any
+from collections import defaultdict
+from operator import itemgetter
+from typing import List, Dict, Any, Optional
 
-def load_content(filename='data/yoto-content.json') -> List[Dict[str, Any]]:
-    """Load content from JSON file"""
-    with open(filename, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    return data.get('data', {}).get('products', [])
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+CONTENT_FILE = 'data/yoto-content.json'
+# Bump whenever normalize_products changes so older snapshots are ignored
+SNAPSHOT_VERSION = 2
+
+def load_content(filename=CONTENT_FILE) -> List[Dict[str, Any]]:
+    """Load content from the preprocessed snapshot if it is current, else from JSON"""
+    products = load_snapshot(filename)
+    if products is None:
+        products = parse_content(filename)
+    return products
+
+def parse_content(filename=CONTENT_FILE) -> List[Dict[str, Any]]:
+    """Load and normalize content from JSON file"""
+    with open(filename, 'rb') as f:
+        raw = f.read()
+    data = orjson.loads(raw) if orjson else json.loads(raw)
+    return normalize_products(data.get('data', {}).get('products', []))
+
+def snapshot_path(filename: str) -> str:
+    """Path of the preprocessed snapshot written by preprocess.py for filename"""
+    return os.path.splitext(filename)[0] + '.pkl'
+
+def load_snapshot(filename: str) -> Optional[List[Dict[str, Any]]]:
+    """Load normalized products from the snapshot, or None if it is missing or stale"""
+    try:
+        stat = os.stat(filename)
+        with open(snapshot_path(filename), 'rb') as f:
+            snapshot = pickle.load(f)
+    except (OSError, EOFError, ValueError, pickle.PickleError):
+        return None
+    if snapshot.get('version') != SNAPSHOT_VERSION or \
+            snapshot.get('source') != (stat.st_mtime_ns, stat.st_size):
+        return None
+    return snapshot['products']
+
+def normalize_products(products: List[Dict]) -> List[Dict]:
+    """Cache lowercased text, parsed numeric and flag fields on each product"""
+    for p in products:
+        p['_title_lc'] = p.get('title', '').lower()
+        p['_author_lc'] = p.get('author', '').lower()
+        p['_ct_lc'] = tuple(ct.lower() for ct in p.get('contentType', []))
+        p['_lang_lc'] = tuple(lang.lower() for lang in p.get('languages', []))
+        age_range = p.get('ageRange') or []
+        p['_age_min'] = age_range[0] if len(age_range) >= 2 else None
+        p['_age_max'] = age_range[1] if len(age_range) >= 2 else None
+        p['_price'] = parse_price(p.get('price'))
+        p['_runtime'] = p.get('runtime') or None
+        p['_available'] = bool(p.get('availableForSale'))
+        p['_is_new'] = p.get('flag') == 'New to Yoto'
+    return products
+
+def parse_price(value) -> Optional[float]:
+    """Convert a price field to float, or None if it is missing or malformed"""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+def match_index(index: Dict[str, List[int]], query: str) -> List[int]:
+    """Positions of products with any indexed value containing query, in catalog order"""
+    positions = set()
+    for value, posting in index.items():
+        if query in value:
+            positions.update(posting)
+    return sorted(positions)
 
 def search_by_title(products: List[Dict], query: str) -> List[Dict]:
     """Search products by title (case-insensitive)"""
     query = query.lower()
-    return [p for p in products if query in p.get('title', '').lower()]
+    return [p for p in products if query in p['_title_lc']]
 
 def filter_by_age_range(products: List[Dict], min_age: int = None, max_age: int = None) -> List[Dict]:
     """Filter products by age range"""
     results = []
     for p in products:
-        age_range = p.get('ageRange', [])
-        if len(age_range) >= 2:
-            product_min, product_max = age_range[0], age_range[1]
-
-            if min_age is not None and product_max < min_age:
-                continue
-            if max_age is not None and product_min > max_age:
-                continue
-            results.append(p)
+        product_min, product_max = p['_age_min'], p['_age_max']
+        if product_min is None and product_max is None:
+            continue
+        if min_age is not None and (product_max is None or product_max < min_age):
+            continue
+        if max_age is not None and (product_min is None or product_min > max_age):
+            continue
+        results.append(p)
     return results
 
 def filter_by_content_type(products: List[Dict], content_type: str) -> List[Dict]:
     """Filter products by content type"""
     content_type = content_type.lower()
     return [p for p in products
-            if any(content_type in ct.lower() for ct in p.get('contentType', []))]
+            if any(content_type in ct for ct in p['_ct_lc'])]
 
 def filter_by_price_range(products: List[Dict], min_price: float = None, max_price: float = None) -> List[Dict]:
     """Filter products by price range"""
     results = []
     for p in products:
-        try:
-            price = float(p.get('price', 0))
-            if min_price is not None and price < min_price:
-                continue
-            if max_price is not None and price > max_price:
-                continue
-            results.append(p)
-        except (ValueError, TypeError):
+        price = p['_price']
+        if price is None:
             continue
+        if min_price is not None and price < min_price:
+            continue
+        if max_price is not None and price > max_price:
+            continue
+        results.append(p)
     return results
 
 def filter_by_author(products: List[Dict], author: str) -> List[Dict]:
     """Filter products by author"""
     author = author.lower()
-    return [p for p in products if author in p.get('author', '').lower()]
+    return [p for p in products if author in p['_author_lc']]
 
 def filter_available_only(products: List[Dict]) -> List[Dict]:
     """Filter only available products"""
-    return [p for p in products if p.get('availableForSale', False)]
+    return [p for p in products if p['_available']]
 
 def sort_products(products: List[Dict], key: str = 'title', reverse: bool = False) -> List[Dict]:
     """Sort products by given key"""
     if key == 'price':
-        return sorted(products, key=lambda p: float(p.get('price', 0)), reverse=reverse)
+        return sorted(products, key=lambda p: p['_price'] or 0.0, reverse=reverse)
     elif key == 'runtime':
-        return sorted(products, key=lambda p: p.get('runtime', 0), reverse=reverse)
+        return sorted(products, key=lambda p: p['_runtime'] or 0, reverse=reverse)
+    elif key == 'title':
+        return sorted(products, key=itemgetter('_title_lc'), reverse=reverse)
     else:
         return sorted(products, key=lambda p: p.get(key, ''), reverse=reverse)
 
@@ -80,9 +152,39 @@ def get_all_content_types(products: List[Dict]) -> List[str]:
 
 def get_all_authors(products: List[Dict]) -> List[str]:
     """Get unique list of all authors"""
-    authors = set(p.get('author', '') for p in products if p.get('author'))
+    authors = {author for p in products if (author := p.get('author'))}
     return sorted(authors)
 
+def collect_stats(products: List[Dict]) -> Dict[str, Any]:
+    """Gather the counters for the statistics view in a single pass over products"""
+    available = 0
+    min_price, max_price = math.inf, -math.inf
+    content_types = set()
+    ct_index = defaultdict(list)
+    authors = set()
+    for i, p in enumerate(products):
+        if p['_available']:
+            available += 1
+        price = p['_price']
+        if price is not None:
+            if price < min_price:
+                min_price = price
+            if price > max_price:
+                max_price = price
+        content_types.update(p.get('contentType', ()))
+        for ct in p['_ct_lc']:
+            ct_index[ct].append(i)
+        if author := p.get('author'):
+            authors.add(author)
+    return {
+        'available': available,
+        'min_price': min_price,
+        'max_price': max_price,
+        'content_types': sorted(content_types),
+        'ct_index': dict(ct_index),
+        'author_count': len(authors),
+    }
+
 def print_product_summary(product: Dict):
     """Print a summary of a product"""
     title = product.get('title', 'Unknown')
@@ -94,22 +196,25 @@ def print_product_summary(product: Dict):
     runtime_min = runtime_sec // 60 if runtime_sec else 0
     available = '✓' if product.get('availableForSale') else '✗'
 
-    print(f"  {title}")
-    print(f"    Author: {author}")
-    print(f"    Price: £{price}")
+    lines = [
+        f"  {title}",
+        f"    Author: {author}",
+        f"    Price: £{price}",
+    ]
     if age_range and len(age_range) >= 2:
-        print(f"    Age: {age_range[0]}-{age_range[1]} years")
+        lines.append(f"    Age: {age_range[0]}-{age_range[1]} years")
     if content_types:
-        print(f"    Type: {content_types}")
+        lines.append(f"    Type: {content_types}")
     if runtime_min:
         hours = runtime_min // 60
         mins = runtime_min % 60
         if hours:
-            print(f"    Runtime: {hours}h {mins}m")
+            lines.append(f"    Runtime: {hours}h {mins}m")
         else:
-            print(f"    Runtime: {mins}m")
-    print(f"    Available: {available}")
-    print()
+            lines.append(f"    Runtime: {mins}m")
+    lines.append(f"    Available: {available}")
+    lines.append("")
+    sys.stdout.write('\n'.join(lines) + '\n')
 
 def main():
     """Main interactive search function"""
@@ -125,27 +230,26 @@ def main():
             print_product_summary(product)
     else:
         # Show statistics and examples
+        stats = collect_stats(products)
         print("=== Content Statistics ===")
         print(f"Total products: {len(products)}")
-        print(f"Available: {len(filter_available_only(products))}")
+        print(f"Available: {stats['available']}")
 
         # Price range
-        prices = [float(p.get('price', 0)) for p in products if p.get('price')]
-        if prices:
-            print(f"Price range: £{min(prices):.2f} - £{max(prices):.2f}")
+        if stats['min_price'] <= stats['max_price']:
+            print(f"Price range: £{stats['min_price']:.2f} - £{stats['max_price']:.2f}")
 
         # Content types
-        content_types = get_all_content_types(products)
+        content_types = stats['content_types']
         print(f"\nContent types ({len(content_types)}):")
         for ct in content_types[:10]:
-            count = len(filter_by_content_type(products, ct))
+            count = len(match_index(stats['ct_index'], ct.lower()))
             print(f"  - {ct}: {count}")
         if len(content_types) > 10:
             print(f"  ... and {len(content_types) - 10} more")
 
         # Top authors
-        authors = get_all_authors(products)
-        print(f"\nTotal authors: {len(authors)}")
+        print(f"\nTotal authors: {stats['author_count']}")
 
         print("\n=== Sample Searches ===")
         print("python3 src/search.py <search term>")
@@ -2,179 +2,351 @@
 """
 Generate statistics and insights about the Yoto content library
 """
+import argparse
 import json
+import os
+import pickle
+import sys
+from bisect import bisect_left
 from collections import Counter
-from typing import List, Dict, Any
+from statistics import median
+from typing import List, Dict, Any, NamedTuple, Optional, Tuple
 
-def load_content(filename='data/yoto-content.json') -> List[Dict[str, Any]]:
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+CONTENT_FILE = 'data/yoto-content.json'
+# Bump whenever extract_columns changes so older column caches are ignored
+COLUMNS_VERSION = 1
+
+# Bucket edges for the distributions, with one label per bucket
+PRICE_EDGES = (10, 20, 30)
+PRICE_LABELS = ('Under £10', '£10-£20', '£20-£30', 'Over £30')
+RUNTIME_EDGES = (1800, 3600, 7200)  # seconds
+RUNTIME_LABELS = ('Under 30 min', '30-60 min', '1-2 hours', 'Over 2 hours')
+
+def load_content(filename=CONTENT_FILE) -> List[Dict[str, Any]]:
     """Load content from JSON file"""
-    with open(filename, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    with open(filename, 'rb') as f:
+        raw = f.read()
+    data = orjson.loads(raw) if orjson else json.loads(raw)
     return data.get('data', {}).get('products', [])
 
-def print_header(text: str):
-    """Print a formatted header"""
-    print(f"\n{'='*80}")
-    print(f" {text}")
-    print('='*80)
+def header_lines(text: str) -> List[str]:
+    """Build the lines of a formatted header"""
+    return ['', '='*80, f" {text}", '='*80]
+
+class Columns(NamedTuple):
+    """Per-field data pulled out of the products in a single pass"""
+    total: int
+    available: int
+    new_items: int
+    prices: List[float]  # positive prices, sorted ascending
+    runtimes: List[int]  # non-zero runtimes in seconds, sorted ascending
+    authors: Counter
+    content_types: Counter
+    languages: Counter
+    ages: List[Tuple[int, int]]  # (min, max) for products with a complete age range
+
+def extract_columns(products: List[Dict]) -> Columns:
+    """Extract every field the statistics need in one pass over products"""
+    available = 0
+    new_items = 0
+    prices = []
+    runtimes = []
+    authors = Counter()
+    content_types = Counter()
+    languages = Counter()
+    ages = []
+
+    # Bind the per-product method calls and defaults once, outside the loop
+    add_price = prices.append
+    add_runtime = runtimes.append
+    add_age = ages.append
+    add_content_types = content_types.update
+    add_languages = languages.update
+    empty = ()
+
+    for p in products:
+        get = p.get
+        if get('availableForSale'):
+            available += 1
+        if get('flag') == 'New to Yoto':
+            new_items += 1
+
+        try:
+            price = float(get('price', 0))
+            if price > 0:
+                add_price(price)
+        except (ValueError, TypeError):
+            pass
+
+        runtime = get('runtime', 0)
+        if runtime:
+            add_runtime(runtime)
+
+        author = get('author')
+        if author:
+            authors[author] += 1
+
+        add_content_types(get('contentType', empty))
+        add_languages(get('languages', empty))
 
-def basic_stats(products: List[Dict]):
+        age_range = get('ageRange', empty)
+        if age_range and len(age_range) >= 2:
+            if age_range[0] is not None and age_range[1] is not None:
+                add_age((age_range[0], age_range[1]))
+
+    prices.sort()
+    runtimes.sort()
+    return Columns(len(products), available, new_items, prices, runtimes,
+                   authors, content_types, languages, ages)
+
+def load_columns(filename: str = CONTENT_FILE) -> Columns:
+    """Load the statistics columns, reusing the on-disk cache while filename is unchanged"""
+    stat = os.stat(filename)
+    key = (COLUMNS_VERSION, stat.st_mtime_ns, stat.st_size)
+    cache_file = os.path.splitext(filename)[0] + '.stats.pkl'
+    try:
+        with open(cache_file, 'rb') as f:
+            cached_key, fields = pickle.load(f)
+        if cached_key == key:
+            return Columns(*fields)
+    except (OSError, EOFError, ValueError, TypeError, pickle.PickleError):
+        pass
+
+    cols = extract_columns(load_content(filename))
+    try:
+        with open(cache_file, 'wb') as f:
+            pickle.dump((key, tuple(cols)), f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        pass
+    return cols
+
+def bucket_counts(sorted_values: List[float], edges: Tuple[float, ...]) -> List[int]:
+    """Count sorted values falling below, between and above the given edges"""
+    cuts = [0] + [bisect_left(sorted_values, edge) for edge in edges] + [len(sorted_values)]
+    return [hi - lo for lo, hi in zip(cuts, cuts[1:])]
+
+def summarize(sorted_values: List[float]) -> Dict[str, Optional[float]]:
+    """Average, median and range of sorted values (all None when there are none)"""
+    if not sorted_values:
+        return {'average': None, 'median': None, 'min': None, 'max': None}
+    return {
+        'average': sum(sorted_values) / len(sorted_values),
+        'median': median(sorted_values),
+        'min': sorted_values[0],
+        'max': sorted_values[-1],
+    }
+
+def age_group_counts(ages: List[Tuple[int, int]]) -> Dict[str, int]:
+    """Count products per age group (groups overlap, so a product can count in several)"""
+    babies = toddlers = preschool = early = middle = preteen = 0
+    for min_age, max_age in ages:
+        if min_age <= 2:
+            babies += 1
+        if min_age <= 4 and max_age >= 2:
+            toddlers += 1
+        if min_age <= 5 and max_age >= 3:
+            preschool += 1
+        if min_age <= 8 and max_age >= 5:
+            early += 1
+        if min_age <= 11 and max_age >= 8:
+            middle += 1
+        if max_age >= 11:
+            preteen += 1
+
+    return {
+        'Babies (0-2)': babies,
+        'Toddlers (2-4)': toddlers,
+        'Preschool (3-5)': preschool,
+        'Early Elementary (5-8)': early,
+        'Middle Elementary (8-11)': middle,
+        'Pre-teen+ (11+)': preteen,
+    }
+
+def basic_stats(cols: Columns):
     """Print basic statistics"""
-    print_header("BASIC STATISTICS")
+    lines = header_lines("BASIC STATISTICS")
 
-    total = len(products)
-    available = len([p for p in products if p.get('availableForSale')])
-    new_items = len([p for p in products if p.get('flag') == 'New to Yoto'])
+    total = cols.total
+    available = cols.available
+    new_items = cols.new_items
 
-    print(f"Total products: {total}")
-    print(f"Available for sale: {available} ({available/total*100:.1f}%)")
-    print(f"New to Yoto: {new_items}")
+    lines.append(f"Total products: {total}")
+    lines.append(f"Available for sale: {available} ({available * 100.0 / total:.1f}%)")
+    lines.append(f"New to Yoto: {new_items}")
 
-def price_stats(products: List[Dict]):
+    sys.stdout.write('\n'.join(lines) + '\n')
+
+def price_stats(cols: Columns):
     """Print price statistics"""
-    print_header("PRICE ANALYSIS")
+    lines = header_lines("PRICE ANALYSIS")
 
-    prices = []
-    for p in products:
-        try:
-            price = float(p.get('price', 0))
-            if price > 0:
-                prices.append(price)
-        except (ValueError, TypeError):
-            continue
+    prices = cols.prices
 
     if prices:
-        print(f"Average price: £{sum(prices)/len(prices):.2f}")
-        print(f"Median price: £{sorted(prices)[len(prices)//2]:.2f}")
-        print(f"Price range: £{min(prices):.2f} - £{max(prices):.2f}")
+        summary = summarize(prices)
+        lines.append(f"Average price: £{summary['average']:.2f}")
+        lines.append(f"Median price: £{summary['median']:.2f}")
+        lines.append(f"Price range: £{summary['min']:.2f} - £{summary['max']:.2f}")
 
         # Price distribution
-        under_10 = len([p for p in prices if p < 10])
-        range_10_20 = len([p for p in prices if 10 <= p < 20])
-        range_20_30 = len([p for p in prices if 20 <= p < 30])
-        over_30 = len([p for p in prices if p >= 30])
-
-        print("\nPrice distribution:")
-        print(f"  Under £10: {under_10} ({under_10/len(prices)*100:.1f}%)")
-        print(f"  £10-£20: {range_10_20} ({range_10_20/len(prices)*100:.1f}%)")
-        print(f"  £20-£30: {range_20_30} ({range_20_30/len(prices)*100:.1f}%)")
-        print(f"  Over £30: {over_30} ({over_30/len(prices)*100:.1f}%)")
-
-def content_type_stats(products: List[Dict]):
-    """Print content type statistics"""
-    print_header("CONTENT TYPES")
+        inv100 = 100.0 / len(prices)
+        lines.append("\nPrice distribution:")
+        for label, count in zip(PRICE_LABELS, bucket_counts(prices, PRICE_EDGES)):
+            lines.append(f"  {label}: {count} ({count * inv100:.1f}%)")
 
-    all_types = []
-    for p in products:
-        all_types.extend(p.get('contentType', []))
+    sys.stdout.write('\n'.join(lines) + '\n')
+
+def content_type_stats(cols: Columns):
+    """Print content type statistics"""
+    lines = header_lines("CONTENT TYPES")
 
-    type_counts = Counter(all_types)
+    type_counts = cols.content_types
 
-    print(f"Total content types: {len(type_counts)}\n")
-    print("Top 15 categories:")
+    lines.append(f"Total content types: {len(type_counts)}\n")
+    lines.append("Top 15 categories:")
+    inv100 = 100.0 / cols.total
     for i, (ct, count) in enumerate(type_counts.most_common(15), 1):
-        pct = count / len(products) * 100
-        print(f"  {i:2}. {ct:<35} {count:4} ({pct:5.1f}%)")
+        pct = count * inv100
+        lines.append(f"  {i:2}. {ct:<35} {count:4} ({pct:5.1f}%)")
 
-def author_stats(products: List[Dict]):
+    sys.stdout.write('\n'.join(lines) + '\n')
+
+def author_stats(cols: Columns):
     """Print author statistics"""
-    print_header("AUTHOR ANALYSIS")
+    lines = header_lines("AUTHOR ANALYSIS")
+
+    author_counts = cols.authors
 
-    authors = [p.get('author', '') for p in products if p.get('author')]
-    author_counts = Counter(authors)
+    lines.append(f"Total unique authors: {len(author_counts)}\n")
+    lines.append("Top 15 authors by number of products:")
+    top = author_counts.most_common(15)
+    # Pad names only as wide as the longest one listed, capped at 40
+    width = min(40, max((len(author) for author, _ in top), default=0))
+    for i, (author, count) in enumerate(top, 1):
+        lines.append(f"  {i:2}. {author:<{width}} {count:3} products")
 
-    print(f"Total unique authors: {len(author_counts)}\n")
-    print("Top 15 authors by number of products:")
-    for i, (author, count) in enumerate(author_counts.most_common(15), 1):
-        print(f"  {i:2}. {author:<40} {count:3} products")
+    sys.stdout.write('\n'.join(lines) + '\n')
 
-def runtime_stats(products: List[Dict]):
+def runtime_stats(cols: Columns):
     """Print runtime statistics"""
-    print_header("RUNTIME ANALYSIS")
+    lines = header_lines("RUNTIME ANALYSIS")
 
-    runtimes = [p.get('runtime', 0) for p in products if p.get('runtime')]
+    runtimes = cols.runtimes
 
     if runtimes:
-        avg_seconds = sum(runtimes) / len(runtimes)
-        avg_minutes = avg_seconds / 60
+        avg_minutes = summarize(runtimes)['average'] / 60
         total_hours = sum(runtimes) / 3600
 
-        print(f"Products with runtime info: {len(runtimes)}")
-        print(f"Average runtime: {avg_minutes:.0f} minutes")
-        print(f"Total content hours: {total_hours:,.0f} hours\n")
+        lines.append(f"Products with runtime info: {len(runtimes)}")
+        lines.append(f"Average runtime: {avg_minutes:.0f} minutes")
+        lines.append(f"Total content hours: {total_hours:,.0f} hours\n")
 
         # Runtime distribution
-        under_30 = len([r for r in runtimes if r < 1800])  # 30 min
-        range_30_60 = len([r for r in runtimes if 1800 <= r < 3600])  # 30-60 min
-        range_1_2h = len([r for r in runtimes if 3600 <= r < 7200])  # 1-2 hours
-        over_2h = len([r for r in runtimes if r >= 7200])  # 2+ hours
-
-        print("Runtime distribution:")
-        print(f"  Under 30 min: {under_30} ({under_30/len(runtimes)*100:.1f}%)")
-        print(f"  30-60 min: {range_30_60} ({range_30_60/len(runtimes)*100:.1f}%)")
-        print(f"  1-2 hours: {range_1_2h} ({range_1_2h/len(runtimes)*100:.1f}%)")
-        print(f"  Over 2 hours: {over_2h} ({over_2h/len(runtimes)*100:.1f}%)")
-
-def age_stats(products: List[Dict]):
+        inv100 = 100.0 / len(runtimes)
+        lines.append("Runtime distribution:")
+        for label, count in zip(RUNTIME_LABELS, bucket_counts(runtimes, RUNTIME_EDGES)):
+            lines.append(f"  {label}: {count} ({count * inv100:.1f}%)")
+
+    sys.stdout.write('\n'.join(lines) + '\n')
+
+def age_stats(cols: Columns):
     """Print age range statistics"""
-    print_header("AGE RANGE ANALYSIS")
+    lines = header_lines("AGE RANGE ANALYSIS")
 
-    age_data = []
-    for p in products:
-        age_range = p.get('ageRange', [])
-        if age_range and len(age_range) >= 2:
-            if age_range[0] is not None and age_range[1] is not None:
-                age_data.append((age_range[0], age_range[1]))
+    age_data = cols.ages
 
     if age_data:
-        print(f"Products with age info: {len(age_data)}\n")
-
-        # Age group distribution
-        age_groups = {
-            'Babies (0-2)': len([a for a in age_data if a[0] <= 2]),
-            'Toddlers (2-4)': len([a for a in age_data if a[0] <= 4 and a[1] >= 2]),
-            'Preschool (3-5)': len([a for a in age_data if a[0] <= 5 and a[1] >= 3]),
-            'Early Elementary (5-8)': len([a for a in age_data if a[0] <= 8 and a[1] >= 5]),
-            'Middle Elementary (8-11)': len([a for a in age_data if a[0] <= 11 and a[1] >= 8]),
-            'Pre-teen+ (11+)': len([a for a in age_data if a[1] >= 11]),
-        }
-
-        print("Content by age group:")
+        lines.append(f"Products with age info: {len(age_data)}\n")
+
+        age_groups = age_group_counts(age_data)
+
+        lines.append("Content by age group:")
+        inv100 = 100.0 / len(age_data)
         for group, count in age_groups.items():
-            pct = count / len(age_data) * 100
-            print(f"  {group:<30} {count:4} ({pct:5.1f}%)")
+            pct = count * inv100
+            lines.append(f"  {group:<30} {count:4} ({pct:5.1f}%)")
 
-def language_stats(products: List[Dict]):
-    """Print language statistics"""
-    print_header("LANGUAGE DISTRIBUTION")
+    sys.stdout.write('\n'.join(lines) + '\n')
 
-    all_languages = []
-    for p in products:
-        all_languages.extend(p.get('languages', []))
+def language_stats(cols: Columns):
+    """Print language statistics"""
+    lines = header_lines("LANGUAGE DISTRIBUTION")
 
-    lang_counts = Counter(all_languages)
+    lang_counts = cols.languages
 
+    inv100 = 100.0 / cols.total
     for lang, count in lang_counts.most_common():
-        pct = count / len(products) * 100
-        print(f"  {lang:<20} {count:4} ({pct:5.1f}%)")
+        pct = count * inv100
+        lines.append(f"  {lang:<20} {count:4} ({pct:5.1f}%)")
+
+    sys.stdout.write('\n'.join(lines) + '\n')
+
+def dump_stats_json(cols: Columns, path: str):
+    """Write the statistics as JSON for other tools to consume"""
+    prices = cols.prices
+    runtimes = cols.runtimes
+    payload = {
+        'basic': {
+            'total': cols.total,
+            'available': cols.available,
+            'new_items': cols.new_items,
+        },
+        'prices': {
+            'count': len(prices),
+            **summarize(prices),
+            'distribution': dict(zip(PRICE_LABELS, bucket_counts(prices, PRICE_EDGES))),
+        },
+        'runtimes': {
+            'count': len(runtimes),
+            'total_seconds': sum(runtimes),
+            **{f'{key}_seconds': value for key, value in summarize(runtimes).items()},
+            'distribution': dict(zip(RUNTIME_LABELS, bucket_counts(runtimes, RUNTIME_EDGES))),
+        },
+        'ages': {
+            'count': len(cols.ages),
+            'groups': age_group_counts(cols.ages),
+        },
+        'content_types': dict(cols.content_types.most_common()),
+        'authors': dict(cols.authors.most_common()),
+        'languages': dict(cols.languages.most_common()),
+    }
+
+    if orjson:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, indent=2, ensure_ascii=False)
 
 def main():
     """Generate all statistics"""
-    products = load_content()
+    parser = argparse.ArgumentParser(description='Statistics about the Yoto content library')
+    parser.add_argument('--json', metavar='PATH', help='Write the statistics as JSON to PATH instead')
+    args = parser.parse_args()
+
+    cols = load_columns()
+
+    if args.json:
+        dump_stats_json(cols, args.json)
+        print(f"Wrote statistics to {args.json}")
+        return
 
-    print("\n" + "="*80)
-    print(" YOTO CONTENT LIBRARY STATISTICS")
-    print("="*80)
+    sys.stdout.write('\n'.join(header_lines("YOTO CONTENT LIBRARY STATISTICS")) + '\n')
 
-    basic_stats(products)
-    price_stats(products)
-    content_type_stats(products)
-    author_stats(products)
-    runtime_stats(products)
-    age_stats(products)
-    language_stats(products)
+    basic_stats(cols)
+    price_stats(cols)
+    content_type_stats(cols)
+    author_stats(cols)
+    runtime_stats(cols)
+    age_stats(cols)
+    language_stats(cols)
 
-    print("\n" + "="*80 + "\n")
+    sys.stdout.write('\n' + '='*80 + '\n\n')
 
 if __name__ == '__main__':
     main()
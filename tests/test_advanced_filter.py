@@ -0,0 +1,51 @@
+"""
+Regression checks for advanced-filter.py
+"""
+import argparse
+import importlib.util
+import os
+import sys
+import unittest
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+sys.path.insert(0, SRC_DIR)
+
+spec = importlib.util.spec_from_file_location('advanced_filter', os.path.join(SRC_DIR, 'advanced-filter.py'))
+advanced_filter = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(advanced_filter)
+
+from search import normalize_products
+
+PRODUCTS = [
+    {'title': 'The BFG', 'author': 'Roald Dahl', 'contentType': ['Stories'], 'languages': ['English']},
+    {'title': 'Matilda', 'author': 'Roald Dahl', 'contentType': ['Stories'], 'languages': ['English']},
+    {'title': 'The Gruffalo', 'author': 'Julia Donaldson', 'contentType': ['Stories'], 'languages': ['English']},
+    {'title': 'Le Petit Prince', 'author': 'Antoine de Saint-Exupéry', 'contentType': ['Stories'], 'languages': ['French']},
+]
+
+FILTER_DEFAULTS = {
+    'search': None, 'author': None, 'content_type': None, 'language': None,
+    'min_age': None, 'max_age': None, 'min_price': None, 'max_price': None,
+    'min_runtime': None, 'max_runtime': None, 'available_only': False, 'new_only': False,
+}
+
+def filtered_titles(**filters):
+    """Run apply_filters over PRODUCTS with the given filter options"""
+    products = normalize_products([dict(p) for p in PRODUCTS])
+    args = argparse.Namespace(**{**FILTER_DEFAULTS, **filters})
+    return [p['title'] for p in advanced_filter.apply_filters(products, args)]
+
+class ApplyFiltersTest(unittest.TestCase):
+    def test_search_with_author(self):
+        self.assertEqual(filtered_titles(search='the', author='dahl'), ['The BFG'])
+
+    def test_search_with_language(self):
+        self.assertEqual(filtered_titles(search='the', language='english'),
+                         ['The BFG', 'The Gruffalo'])
+
+    def test_search_with_content_type(self):
+        self.assertEqual(filtered_titles(search='prince', content_type='stories'),
+                         ['Le Petit Prince'])
+
+if __name__ == '__main__':
+    unittest.main()
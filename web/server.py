@@ -2,18 +2,113 @@
 """
 Simple HTTP server for the Yoto web interface
 """
+import email.utils
+import gzip
 import http.server
-import socketserver
+import io
 import os
 import sys
+import urllib.parse
 
 PORT = 8000
 
+# Text formats worth compressing; images and fonts are already compressed
+COMPRESSIBLE_EXTENSIONS = ('.html', '.css', '.js', '.json', '.svg', '.txt', '.md')
+
+# Gzipped file bodies by path, stored with the mtime they were built from
+_gzip_cache = {}
+
+def accepts_gzip(accept_encoding):
+    """Check whether an Accept-Encoding header allows a gzip response"""
+    qualities = {}
+    for item in accept_encoding.split(','):
+        coding, _, params = item.partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qualities[coding] = q
+    if 'gzip' in qualities:
+        return qualities['gzip'] > 0
+    return qualities.get('*', 0) > 0
+
 class MyHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
+    # Keep connections open so the browser can reuse them for every asset
+    protocol_version = 'HTTP/1.1'
+
+    def send_head(self):
+        path = self.translate_path(self.path)
+        if (not accepts_gzip(self.headers.get('Accept-Encoding', ''))
+                or not path.endswith(COMPRESSIBLE_EXTENSIONS)
+                or not os.path.isfile(path)):
+            return super().send_head()
+
+        st = os.stat(path)
+        if self.not_modified_since(st.st_mtime):
+            self.send_response(304)
+            self.end_headers()
+            return None
+
+        cached = _gzip_cache.get(path)
+        if cached is None or cached[0] != st.st_mtime_ns:
+            with open(path, 'rb') as f:
+                cached = (st.st_mtime_ns, gzip.compress(f.read(), compresslevel=6))
+            _gzip_cache[path] = cached
+        body = cached[1]
+
+        self.send_response(200)
+        self.send_header('Content-type', self.guess_type(path))
+        self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Last-Modified', self.date_time_string(st.st_mtime))
+        self.end_headers()
+        return io.BytesIO(body)
+
+    def not_modified_since(self, mtime):
+        """Check an If-Modified-Since header against a file's mtime"""
+        if 'If-None-Match' in self.headers:
+            return False
+        since = self.headers.get('If-Modified-Since')
+        if not since:
+            return False
+        try:
+            since = email.utils.parsedate_to_datetime(since)
+        except (TypeError, IndexError, OverflowError, ValueError):
+            return False
+        if since.tzinfo is None:
+            return False
+        return int(mtime) <= since.timestamp()
+
+    def send_response(self, code, message=None):
+        # Remember the status so end_headers can pick the caching policy
+        self.response_code = code
+        super().send_response(code, message)
+
+    def copyfile(self, source, outputfile):
+        # Let the kernel copy file bodies straight to the socket; socket.sendfile
+        # falls back to regular sends for objects without a file descriptor
+        self.connection.sendfile(source)
+
     def end_headers(self):
         # Add CORS headers
         self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Cache-Control', 'no-store, no-cache, must-revalidate')
+        path = urllib.parse.urlsplit(self.path).path
+        # Compressible files may be sent gzipped or not, so caches must key on the encoding
+        if path.endswith(COMPRESSIBLE_EXTENSIONS):
+            self.send_header('Vary', 'Accept-Encoding')
+        # Static assets served successfully can be reused briefly and are refreshed via
+        # Last-Modified once stale; pages, errors and redirects always revalidate
+        if self.response_code in (200, 304) and not path.endswith(('.html', '/')):
+            self.send_header('Cache-Control', 'public, max-age=60')
+        else:
+            self.send_header('Cache-Control', 'no-store, no-cache, must-revalidate')
         super().end_headers()
 
     def log_message(self, format, *args):
@@ -31,7 +126,8 @@ def start_server():
     print(f"  http://localhost:{PORT}/web/")
     print(f"\nPress Ctrl+C to stop the server\n")
 
-    with socketserver.TCPServer(("", PORT), MyHTTPRequestHandler) as httpd:
+    with http.server.ThreadingHTTPServer(("", PORT), MyHTTPRequestHandler) as httpd:
+        httpd.daemon_threads = True
         try:
             httpd.serve_forever()
         except KeyboardInterrupt: